@@ -2,15 +2,39 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Dict
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, __version__
+from .const import (
+    CONF_CASSETTE,
+    CONF_CONNECTIVITY,
+    CONF_ECU_STALE_AFTER,
+    CONF_INVERTER_STALE_AFTER,
+    CONF_MODE,
+    CONF_SPEED,
+    CONF_TRANSPORT,
+    DATA_CONNECTIVITY,
+    DATA_TRANSPORT,
+    DOMAIN,
+    ECU_STALE_AFTER,
+    INVERTER_STALE_AFTER,
+    SIGNAL_ENTRY_UNLOADED,
+    TRANSPORT_MODE_RECORD,
+    TRANSPORT_MODE_REPLAY,
+    __version__,
+)
 from .coordinator import APSystemsDataUpdateCoordinator
+from .executor import async_get_executor
+from .services import async_setup_services
+from .transport import RecordingTransport, ReplayTransport
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,13 +44,75 @@ PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.DEVICE_TRACKER]
 __version__ = "1.0.0"
 __version_info__ = (1, 0, 0)
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_TRANSPORT): vol.Schema(
+                    {
+                        vol.Required(CONF_MODE): vol.In(
+                            [TRANSPORT_MODE_RECORD, TRANSPORT_MODE_REPLAY]
+                        ),
+                        vol.Required(CONF_CASSETTE): cv.string,
+                        vol.Optional(CONF_SPEED, default=1.0): vol.All(
+                            vol.Coerce(float), vol.Range(min=0)
+                        ),
+                    }
+                ),
+                vol.Optional(CONF_CONNECTIVITY, default={}): vol.Schema(
+                    {
+                        vol.Optional(
+                            CONF_INVERTER_STALE_AFTER, default=INVERTER_STALE_AFTER
+                        ): cv.positive_int,
+                        vol.Optional(
+                            CONF_ECU_STALE_AFTER, default=ECU_STALE_AFTER
+                        ): cv.positive_int,
+                    }
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the APSystems component."""
     _LOGGER.info(f"APSystems API Integration v{__version__} starting up")
+    async_setup_websocket_api(hass)
+    async_setup_services(hass)
+
+    hass.data[DATA_CONNECTIVITY] = config.get(DOMAIN, {}).get(CONF_CONNECTIVITY, {})
+
+    transport_config = config.get(DOMAIN, {}).get(CONF_TRANSPORT)
+    if transport_config:
+        await _async_setup_transport(hass, transport_config)
+
     return True
 
 
+async def _async_setup_transport(hass: HomeAssistant, transport_config: Dict[str, Any]) -> None:
+    """Route API calls through a cassette recorder or player."""
+    cassette = hass.config.path(transport_config[CONF_CASSETTE])
+    if transport_config[CONF_MODE] == TRANSPORT_MODE_REPLAY:
+        transport = await async_get_executor(hass).async_add_job(
+            ReplayTransport, cassette, transport_config[CONF_SPEED]
+        )
+    else:
+        transport = RecordingTransport(cassette)
+    hass.data[DATA_TRANSPORT] = transport
+    _LOGGER.warning(
+        f"APSystems API calls are in {transport_config[CONF_MODE]} mode using {cassette}"
+    )
+
+    @callback
+    def _async_log_stats(event: Event) -> None:
+        """Log transport statistics for comparing runs."""
+        _LOGGER.info(f"APSystems transport stats: {transport.stats}")
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_log_stats)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up APSystems from a config entry."""
     coordinator = APSystemsDataUpdateCoordinator(hass, entry)
@@ -45,5 +131,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED, entry.entry_id)
 
     return unload_ok
\ No newline at end of file
@@ -9,7 +9,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import DATA_TRANSPORT, DOMAIN
+from .executor import async_get_executor
 from .utils import APSystemsAPI
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,11 +34,11 @@ class InvalidAuth(HomeAssistantError):
 
 async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate the user input allows us to connect."""
-    api = APSystemsAPI(data["app_id"], data["app_secret"])
+    api = APSystemsAPI(data["app_id"], data["app_secret"], transport=hass.data.get(DATA_TRANSPORT))
     
     try:
         # Test the connection by getting system details
-        system_details = await hass.async_add_executor_job(
+        system_details = await async_get_executor(hass).async_add_job(
             api.get_system_details, data["system_id"]
         )
         
@@ -0,0 +1,156 @@
+"""Fleet connectivity tracking for APSystems inverters and ECUs."""
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import EVENT_CONNECTIVITY_CHANGED
+from .telemetry import InverterPowerTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Per-channel lifetime energy in an inverter summary ("t1", "t2", ...)
+_LIFETIME_KEY = re.compile(r"^t\d+$")
+
+
+def _lifetime_energy(summary: Dict[str, Any]) -> Optional[float]:
+    """Return an inverter's lifetime energy summed over its channels."""
+    values = [value for key, value in summary.items() if _LIFETIME_KEY.match(key.strip())]
+    if not values and summary.get("energy") is not None:
+        values = [summary["energy"]]
+    try:
+        return round(sum(float(value) for value in values), 3) if values else None
+    except (ValueError, TypeError):
+        return None
+
+
+class ConnectivityTracker:
+    """Derive online/offline state from when devices last reported.
+
+    An inverter counts as having reported when its batch energy for today
+    rises within the same day or its lifetime energy rises, or when today's
+    power curve holds a newer non-zero sample. The first values seen after a
+    restart or a date change are only a baseline, so the midnight reset of
+    daily totals is never taken for a report. Missing data from a failed API
+    call leaves the last report untouched, and unchanged totals do not
+    refresh it, so a device is only offline once its last report is older
+    than the staleness threshold. An ECU's last report is the latest of its
+    inverters.
+    """
+
+    def __init__(self, hass: HomeAssistant, system_id: str, inverter_stale_after: int, ecu_stale_after: int) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.system_id = system_id
+        self.inverter_stale_after = timedelta(seconds=inverter_stale_after)
+        self.ecu_stale_after = timedelta(seconds=ecu_stale_after)
+        self.inverter_last_report: Dict[str, datetime] = {}
+        self.ecu_last_report: Dict[str, datetime] = {}
+        self._energy_today: Dict[str, float] = {}
+        self._energy_today_date: Optional[str] = None
+        self._lifetime: Dict[str, float] = {}
+        self._online: Dict[str, bool] = {}
+        self._first_seen: Dict[str, datetime] = {}
+
+    def async_update(
+        self,
+        now: datetime,
+        data: Dict[str, Any],
+        inverter_ecu: Dict[str, str],
+        power_curves: Dict[str, InverterPowerTelemetry],
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Update last reports from a refresh and return fleet connectivity.
+
+        ``power_curves`` must hold today's curves only; sample times are
+        placed on today's date.
+        """
+        energy_today = data.get("inverter_energy_today", {})
+        inverter_data = data.get("inverter_data", {})
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self._energy_today_date != midnight.date().isoformat():
+            self._energy_today = {}
+            self._energy_today_date = midnight.date().isoformat()
+
+        for inverter in data.get("inverters", []):
+            uid = inverter.get("uid")
+            if not uid:
+                continue
+            ecu_id = inverter_ecu.get(uid)
+            self._first_seen.setdefault(f"inverter_{uid}", now)
+            if ecu_id:
+                self._first_seen.setdefault(f"ecu_{ecu_id}", now)
+            reported: Optional[datetime] = None
+
+            # The first value seen is only a baseline, and only a rise is a report
+            today = energy_today.get(uid)
+            if today is not None:
+                if uid in self._energy_today and today > self._energy_today[uid]:
+                    reported = now
+                self._energy_today[uid] = today
+            lifetime = _lifetime_energy(inverter_data.get(uid) or {})
+            if lifetime is not None:
+                if uid in self._lifetime and lifetime > self._lifetime[uid]:
+                    reported = now
+                self._lifetime[uid] = lifetime
+
+            telemetry = power_curves.get(ecu_id)
+            if reported is None and telemetry is not None:
+                minutes = telemetry.last_report(uid)
+                if minutes is not None:
+                    reported = midnight + timedelta(minutes=minutes)
+
+            if reported is None or reported > now:
+                continue
+            if reported > self.inverter_last_report.get(uid, datetime.min):
+                self.inverter_last_report[uid] = reported
+                if ecu_id and reported > self.ecu_last_report.get(ecu_id, datetime.min):
+                    self.ecu_last_report[ecu_id] = reported
+
+        return {
+            "inverters": self._evaluate("inverter", self.inverter_last_report, self.inverter_stale_after, now),
+            "ecus": self._evaluate("ecu", self.ecu_last_report, self.ecu_stale_after, now),
+        }
+
+    def _evaluate(self, device_type: str, last_reports: Dict[str, datetime], stale_after: timedelta, now: datetime) -> Dict[str, Dict[str, Any]]:
+        """Apply the staleness threshold and fire events on transitions.
+
+        A device that never reported is unknown until it has been seen for
+        longer than the threshold, then offline. Events fire on every change
+        of a known state and when a device's first known state is offline.
+        """
+        states = {}
+        prefix = f"{device_type}_"
+        for key, first_seen in self._first_seen.items():
+            if not key.startswith(prefix):
+                continue
+            device_id = key[len(prefix):]
+            last_report = last_reports.get(device_id)
+            if last_report is not None:
+                online = now - last_report <= stale_after
+            elif now - first_seen > stale_after:
+                online = False
+            else:
+                continue
+
+            previous = self._online.get(key)
+            self._online[key] = online
+            if previous != online and (previous is not None or not online):
+                _LOGGER.info(f"APSystems {device_type} {device_id} is now {'online' if online else 'offline'}")
+                self.hass.bus.async_fire(
+                    EVENT_CONNECTIVITY_CHANGED,
+                    {
+                        "system_id": self.system_id,
+                        "device_type": device_type,
+                        "device_id": device_id,
+                        "online": online,
+                        "last_report": last_report.isoformat() if last_report else None,
+                    },
+                )
+            states[device_id] = {
+                "online": online,
+                "last_report": last_report.isoformat() if last_report else None,
+            }
+        return states
@@ -26,6 +26,42 @@ ENDPOINT_INVERTER_ENERGY_DAY = "/user/api/v2/systems/{sid}/devices/inverter/batc
 UPDATE_INTERVAL = 300  # 5 minutes
 UPDATE_INTERVAL_FAST = 60  # 1 minute for power data
 
+# Executor limits for blocking API calls
+EXECUTOR_MAX_WORKERS = 4
+EXECUTOR_MAX_QUEUE = 16
+
+# hass.data keys shared by all config entries
+DATA_EXECUTOR = f"{DOMAIN}_executor"
+DATA_TRANSPORT = f"{DOMAIN}_transport"
+DATA_CONNECTIVITY = f"{DOMAIN}_connectivity"
+
+# Record/replay transport (YAML only, for performance regression runs)
+CONF_TRANSPORT = "transport"
+CONF_MODE = "mode"
+CONF_CASSETTE = "cassette"
+CONF_SPEED = "speed"
+TRANSPORT_MODE_RECORD = "record"
+TRANSPORT_MODE_REPLAY = "replay"
+
+# Connectivity: devices are offline once their last report is older than this
+CONF_CONNECTIVITY = "connectivity"
+CONF_INVERTER_STALE_AFTER = "inverter_stale_after"
+CONF_ECU_STALE_AFTER = "ecu_stale_after"
+INVERTER_STALE_AFTER = 1200  # 20 minutes
+ECU_STALE_AFTER = 1800  # 30 minutes
+
+# Events
+EVENT_CONNECTIVITY_CHANGED = f"{DOMAIN}_connectivity_changed"
+
+# Dispatcher signals
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded"
+
+# Services
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+
+# Energy rollup periods, kept as running totals
+ROLLUP_PERIODS = ("week", "month", "year")
+
 # Sensor types
 SENSOR_TYPES = {
     "system_power": {
@@ -48,6 +84,27 @@ SENSOR_TYPES = {
         "device_class": "energy",
         "state_class": "total_increasing",
     },
+    "system_energy_week": {
+        "name": "System Energy This Week",
+        "unit": "kWh",
+        "icon": "mdi:solar-panel",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    },
+    "system_energy_month": {
+        "name": "System Energy This Month",
+        "unit": "kWh",
+        "icon": "mdi:solar-panel",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    },
+    "system_energy_year": {
+        "name": "System Energy This Year",
+        "unit": "kWh",
+        "icon": "mdi:solar-panel",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    },
     "inverter_power": {
         "name": "Inverter Power",
         "unit": "W",
@@ -68,6 +125,27 @@ SENSOR_TYPES = {
         "device_class": "energy",
         "state_class": "total_increasing",
     },
+    "inverter_energy_week": {
+        "name": "Inverter Energy This Week",
+        "unit": "kWh",
+        "icon": "mdi:solar-panel",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    },
+    "inverter_energy_month": {
+        "name": "Inverter Energy This Month",
+        "unit": "kWh",
+        "icon": "mdi:solar-panel",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    },
+    "inverter_energy_year": {
+        "name": "Inverter Energy This Year",
+        "unit": "kWh",
+        "icon": "mdi:solar-panel",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    },
 }
 
 # Device types
@@ -1,14 +1,29 @@
 """Data coordinator for APSystems integration."""
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, UPDATE_INTERVAL
+from .connectivity import ConnectivityTracker
+from .const import (
+    CONF_ECU_STALE_AFTER,
+    CONF_INVERTER_STALE_AFTER,
+    DATA_CONNECTIVITY,
+    DATA_TRANSPORT,
+    DOMAIN,
+    ECU_STALE_AFTER,
+    INVERTER_STALE_AFTER,
+    UPDATE_INTERVAL,
+)
+from .executor import async_get_executor
+from .rollups import EnergyRollups
+from .telemetry import InverterPowerTelemetry
+from .transport import ReplayTransport
 from .utils import APSystemsAPI
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,17 +35,41 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
         self.entry = entry
+        transport = hass.data.get(DATA_TRANSPORT)
         self.api = APSystemsAPI(
             entry.data["app_id"],
-            entry.data["app_secret"]
+            entry.data["app_secret"],
+            transport=transport,
         )
         self.system_id = entry.data["system_id"]
+        self.executor = async_get_executor(hass)
+        self.rollups = EnergyRollups(hass, entry)
+        self._power_curves: Dict[str, InverterPowerTelemetry] = {}
+        self._power_curves_updated: Optional[datetime] = None
+        self._power_curves_lock = asyncio.Lock()
+        self._inverter_ecu: Dict[str, str] = {}
+        self._ecu_ids: List[str] = []
+        self._energy_today: Dict[str, float] = {}
+        self._energy_today_date: Optional[str] = None
+        connectivity_config = hass.data.get(DATA_CONNECTIVITY, {})
+        self.connectivity = ConnectivityTracker(
+            hass,
+            self.system_id,
+            connectivity_config.get(CONF_INVERTER_STALE_AFTER, INVERTER_STALE_AFTER),
+            connectivity_config.get(CONF_ECU_STALE_AFTER, ECU_STALE_AFTER),
+        )
+        
+        # A replayed cassette is played back on a schedule compressed by its speed
+        update_interval: Optional[timedelta] = timedelta(seconds=UPDATE_INTERVAL)
+        if isinstance(transport, ReplayTransport):
+            interval = transport.scale_interval(UPDATE_INTERVAL)
+            update_interval = timedelta(seconds=interval) if interval else None
         
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_interval=update_interval,
         )
 
     async def _async_update_data(self) -> Dict[str, Any]:
@@ -44,13 +83,16 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
                 "inverters": [],
                 "meters": [],
                 "inverter_data": {},
+                "inverter_energy_today": {},
+                "energy_rollups": {},
+                "connectivity": {"inverters": {}, "ecus": {}},
                 "last_update": datetime.now().isoformat(),
                 "errors": []
             }
             
             # Get system details with error handling
             try:
-                system_details = await self.hass.async_add_executor_job(
+                system_details = await self.executor.async_add_job(
                     self.api.get_system_details, self.system_id
                 )
                 if system_details.get("code") == 0:
@@ -64,7 +106,7 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
             
             # Get system summary energy with error handling
             try:
-                system_energy = await self.hass.async_add_executor_job(
+                system_energy = await self.executor.async_add_job(
                     self.api.get_system_summary_energy, self.system_id
                 )
                 if system_energy.get("code") == 0:
@@ -78,7 +120,7 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
             
             # Get system inverters with error handling
             try:
-                inverters = await self.hass.async_add_executor_job(
+                inverters = await self.executor.async_add_job(
                     self.api.get_system_inverters, self.system_id
                 )
                 if inverters.get("code") == 0:
@@ -92,7 +134,7 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
             
             # Get system meters if available (optional)
             try:
-                meters = await self.hass.async_add_executor_job(
+                meters = await self.executor.async_add_job(
                     self.api.get_system_meters, self.system_id
                 )
                 if meters.get("code") == 0:
@@ -107,7 +149,7 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
                     inverter_id = inverter.get("uid")
                     if inverter_id:
                         try:
-                            inverter_energy = await self.hass.async_add_executor_job(
+                            inverter_energy = await self.executor.async_add_job(
                                 self.api.get_inverter_summary_energy, 
                                 self.system_id, 
                                 inverter_id
@@ -122,11 +164,39 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
                             data["inverter_data"][inverter_id] = {}
             
             # Get today's date for daily energy
-            today = datetime.now().strftime("%Y-%m-%d")
+            now = datetime.now()
+            today = now.strftime("%Y-%m-%d")
+            
+            # Get today's energy for all inverters, one batch call per ECU
+            if data["system_details"].get("ecu"):
+                self._ecu_ids = list(data["system_details"]["ecu"])
+            fetched, complete = await self._async_get_energy_day(today)
+            
+            # Keep the previous value for inverters that are missing or went down,
+            # so a failed ECU call never looks like a meter reset
+            if self._energy_today_date != today:
+                self._energy_today = {}
+                self._energy_today_date = today
+            for inverter_id, energy in fetched.items():
+                if energy >= self._energy_today.get(inverter_id, 0.0):
+                    self._energy_today[inverter_id] = energy
+            data["inverter_energy_today"] = dict(self._energy_today)
+            
+            # Roll today's energy into the week/month/year totals; the system
+            # total is only updated when every ECU reported
+            try:
+                energy_today = dict(self._energy_today)
+                if complete:
+                    energy_today["system"] = round(sum(self._energy_today.values()), 3)
+                data["energy_rollups"] = await self.rollups.async_update(
+                    now.date(), energy_today, self._async_get_closed_day
+                )
+            except Exception as e:
+                _LOGGER.warning(f"Failed to update energy rollups: {e}")
             
             # Get system energy for today with error handling
             try:
-                system_energy_today = await self.hass.async_add_executor_job(
+                system_energy_today = await self.executor.async_add_job(
                     self.api.get_system_energy_period,
                     self.system_id,
                     today,
@@ -140,6 +210,21 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.warning(f"Failed to get today's energy: {e}")
                 data["system_energy_today"] = {}
             
+            # Derive fleet connectivity from last-report timestamps
+            try:
+                power_curves = (
+                    self._power_curves
+                    if self._power_curves_updated is not None
+                    and self._power_curves_updated.date() == now.date()
+                    else {}
+                )
+                data["connectivity"] = self.connectivity.async_update(
+                    now, data, self._inverter_ecu, power_curves
+                )
+            except Exception as e:
+                _LOGGER.warning(f"Failed to update connectivity: {e}")
+            
+            data["executor_stats"] = self.executor.stats
             return data
             
         except Exception as error:
@@ -152,15 +237,62 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
                 "inverters": [],
                 "meters": [],
                 "inverter_data": {},
+                "inverter_energy_today": {},
+                "energy_rollups": {},
+                "connectivity": {"inverters": {}, "ecus": {}},
                 "last_update": datetime.now().isoformat(),
+                "executor_stats": self.executor.stats,
                 "errors": [f"Critical error: {error}"]
             }
 
+    async def _async_get_energy_day(self, day: str) -> Tuple[Dict[str, float], bool]:
+        """Get a day's energy per inverter and whether every ECU reported."""
+        energy: Dict[str, float] = {}
+        complete = bool(self._ecu_ids)
+        for ecu_id in self._ecu_ids:
+            try:
+                ecu_energy = await self.executor.async_add_job(
+                    self.api.get_inverter_energy_day,
+                    self.system_id,
+                    ecu_id,
+                    day
+                )
+                if ecu_energy.get("code") == 0:
+                    self._add_inverter_energy_today(
+                        energy,
+                        ecu_energy.get("data", {}).get("energy", []),
+                        ecu_id
+                    )
+                else:
+                    _LOGGER.warning(f"ECU {ecu_id} energy error: {ecu_energy.get('message', 'Unknown error')}")
+                    complete = False
+            except Exception as e:
+                _LOGGER.warning(f"Failed to get inverter energy for ECU {ecu_id}: {e}")
+                complete = False
+        return energy, complete
+
+    async def _async_get_closed_day(self, day: date) -> Dict[str, float]:
+        """Get the final energy of a finished day for the rollups."""
+        energy, complete = await self._async_get_energy_day(day.isoformat())
+        if complete:
+            energy["system"] = round(sum(energy.values()), 3)
+        return energy
+
+    def _add_inverter_energy_today(self, energy_today: Dict[str, float], entries: List[str], ecu_id: str) -> None:
+        """Sum batch energy entries ("uid-channel-energy") per inverter."""
+        for entry in entries:
+            try:
+                inverter_id, _, energy = entry.rsplit("-", 2)
+                energy_today[inverter_id] = round(energy_today.get(inverter_id, 0.0) + float(energy), 3)
+                self._inverter_ecu[inverter_id] = ecu_id
+            except (AttributeError, ValueError):
+                _LOGGER.debug(f"Skipping malformed batch energy entry: {entry}")
+
     async def get_inverter_energy_today(self, inverter_id: str) -> Dict[str, Any]:
         """Get today's energy data for a specific inverter."""
         try:
             today = datetime.now().strftime("%Y-%m-%d")
-            return await self.hass.async_add_executor_job(
+            return await self.executor.async_add_job(
                 self.api.get_inverter_energy_period,
                 self.system_id,
                 inverter_id,
@@ -172,16 +304,43 @@ class APSystemsDataUpdateCoordinator(DataUpdateCoordinator):
             return {"data": {}}
 
     async def get_inverter_power_data(self, ecu_id: str) -> Dict[str, Any]:
-        """Get power telemetry data for inverters under an ECU."""
+        """Get power telemetry data for inverters under an ECU.
+
+        The payload is stream-decoded into an InverterPowerTelemetry holding
+        float32 columns per inverter and channel.
+        """
         try:
             today = datetime.now().strftime("%Y-%m-%d")
-            return await self.hass.async_add_executor_job(
-                self.api.get_inverter_energy_day,
+            return await self.executor.async_add_job(
+                self.api.get_inverter_power_telemetry,
                 self.system_id,
                 ecu_id,
                 today,
-                "power"
+                True
             )
         except Exception as error:
             _LOGGER.error(f"Failed to get power data for ECU {ecu_id}: {error}")
             return {"data": {}}
+
+    async def async_get_power_curves(self) -> Dict[str, InverterPowerTelemetry]:
+        """Get today's power curves per ECU, cached for one update interval.
+
+        Concurrent callers share a single fetch of a stale cache.
+        """
+        async with self._power_curves_lock:
+            now = datetime.now()
+            if (
+                self._power_curves_updated is None
+                or self._power_curves_updated.date() != now.date()
+                or now - self._power_curves_updated >= timedelta(seconds=UPDATE_INTERVAL)
+            ):
+                curves = {}
+                for ecu_id in (self.data or {}).get("system_details", {}).get("ecu", []):
+                    power_data = await self.get_inverter_power_data(ecu_id)
+                    if power_data.get("code") == 0:
+                        curves[ecu_id] = power_data["data"]
+                    else:
+                        _LOGGER.warning(f"ECU {ecu_id} power error: {power_data.get('message', 'Unknown error')}")
+                self._power_curves = curves
+                self._power_curves_updated = now
+            return self._power_curves
@@ -8,10 +8,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import APSystemsDataUpdateCoordinator
+from .entity import APSystemsCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,9 +39,11 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class APSystemsSystemDevice(CoordinatorEntity, DeviceTracker):
+class APSystemsSystemDevice(APSystemsCoordinatorEntity, DeviceTracker):
     """Representation of an APSystems system device."""
 
+    _span_name = "entity_write.device_tracker"
+
     def __init__(self, coordinator: APSystemsDataUpdateCoordinator) -> None:
         """Initialize the device."""
         super().__init__(coordinator)
@@ -67,10 +69,19 @@ class APSystemsSystemDevice(CoordinatorEntity, DeviceTracker):
             return False
         return True  # If we have data, the system is connected
 
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return APSystems executor occupancy for tuning."""
+        if not self.coordinator.data:
+            return {}
+        return self.coordinator.data.get("executor_stats", {})
+
 
-class APSystemsInverterDevice(CoordinatorEntity, DeviceTracker):
+class APSystemsInverterDevice(APSystemsCoordinatorEntity, DeviceTracker):
     """Representation of an APSystems inverter device."""
 
+    _span_name = "entity_write.device_tracker"
+
     def __init__(self, coordinator: APSystemsDataUpdateCoordinator, inverter_id: str) -> None:
         """Initialize the device."""
         super().__init__(coordinator)
@@ -105,6 +116,17 @@ class APSystemsInverterDevice(CoordinatorEntity, DeviceTracker):
         if not self.coordinator.data:
             return False
         
-        # Check if inverter data is available
-        inverter_data = self.coordinator.data.get("inverter_data", {}).get(self._inverter_id, {})
-        return bool(inverter_data)
+        # Online until the last report is older than the staleness threshold
+        state = self.coordinator.data.get("connectivity", {}).get("inverters", {}).get(self._inverter_id)
+        if state is None:
+            # Not known yet after a restart, fall back to whether the inverter returned data
+            return bool(self.coordinator.data.get("inverter_data", {}).get(self._inverter_id))
+        return state["online"]
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return when the inverter last reported."""
+        if not self.coordinator.data:
+            return {}
+        connectivity = self.coordinator.data.get("connectivity", {}).get("inverters", {})
+        return {"last_report": connectivity.get(self._inverter_id, {}).get("last_report")}
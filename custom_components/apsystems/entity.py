@@ -0,0 +1,18 @@
+"""Base entity for the APSystems integration."""
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .profiler import span
+
+
+class APSystemsCoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity whose state writes are timed as a profiler span."""
+
+    _span_name = "entity_write"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        with span(self._span_name):
+            super()._handle_coordinator_update()
@@ -0,0 +1,132 @@
+"""Bounded executor for APSystems API calls."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from . import profiler
+from .const import DATA_EXECUTOR, EXECUTOR_MAX_QUEUE, EXECUTOR_MAX_WORKERS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(HomeAssistantError):
+    """Error to indicate the APSystems executor cannot accept more work."""
+
+
+class APSystemsExecutor:
+    """Small, size-capped worker pool for blocking APSystems I/O.
+
+    Keeps slow or hanging EMA calls off Home Assistant's shared executor.
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` wait
+    for a free worker; anything beyond that is rejected immediately.
+    """
+
+    def __init__(self, max_workers: int = EXECUTOR_MAX_WORKERS, max_queue: int = EXECUTOR_MAX_QUEUE) -> None:
+        """Initialize the executor."""
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="apsystems_api"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+        self._peak_active = 0
+        self._peak_queued = 0
+
+    async def async_add_job(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on the pool and return its result."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturated(
+                    f"APSystems executor saturated ({self._pending} jobs pending)"
+                )
+            self._pending += 1
+            self._peak_queued = max(self._peak_queued, self._pending - self.max_workers)
+
+        # The slot is released when the job itself finishes or is cancelled,
+        # not when the caller stops waiting, so cancelled callers cannot leak it
+        future = self._pool.submit(self._run, time.monotonic(), func, args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future) -> None:
+        """Free the slot of a finished or cancelled job."""
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, submitted: float, func: Callable[..., Any], args: tuple) -> Any:
+        """Run a job on a worker thread, recording its queue wait."""
+        wait = time.monotonic() - submitted
+        profiler.record("executor_queue", wait)
+        with self._lock:
+            self._active += 1
+            self._peak_active = max(self._peak_active, self._active)
+            self._wait_total += wait
+            self._wait_last = wait
+            self._wait_max = max(self._wait_max, wait)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return pool occupancy and queue wait statistics."""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": max(self._pending - self._active, 0),
+                "peak_active": self._peak_active,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_last": round(self._wait_last, 3),
+                "wait_avg": round(self._wait_total / started, 3) if started else 0.0,
+                "wait_max": round(self._wait_max, 3),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for running jobs."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@callback
+def async_get_executor(hass: HomeAssistant) -> APSystemsExecutor:
+    """Return the shared APSystems executor, creating it on first use."""
+    executor: APSystemsExecutor = hass.data.get(DATA_EXECUTOR)
+    if executor is None:
+        executor = hass.data[DATA_EXECUTOR] = APSystemsExecutor()
+
+        @callback
+        def _async_shutdown(event: Event) -> None:
+            """Shut the executor down when Home Assistant stops."""
+            hass.data.pop(DATA_EXECUTOR, None)
+            executor.shutdown()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+        _LOGGER.debug(
+            "Created APSystems executor (%s workers, %s queued)",
+            executor.max_workers,
+            executor.max_queue,
+        )
+    return executor
@@ -0,0 +1,83 @@
+"""Span tracing for APSystems refresh profiling."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class SpanTracer:
+    """Accumulate count, total and maximum duration per named phase.
+
+    Spans may be recorded from the event loop and executor threads alike.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracer."""
+        self._lock = threading.Lock()
+        self._phases: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, duration: float) -> None:
+        """Add one measured duration to a phase."""
+        with self._lock:
+            phase = self._phases.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            phase["count"] += 1
+            phase["total"] += duration
+            phase["max"] = max(phase["max"], duration)
+
+    @property
+    def phases(self) -> Dict[str, Dict[str, Any]]:
+        """Return the timing breakdown per phase, slowest first."""
+        with self._lock:
+            phases = sorted(self._phases.items(), key=lambda item: item[1]["total"], reverse=True)
+            return {
+                name: {
+                    "count": int(phase["count"]),
+                    "total": round(phase["total"], 4),
+                    "avg": round(phase["total"] / phase["count"], 4),
+                    "max": round(phase["max"], 4),
+                }
+                for name, phase in phases
+            }
+
+
+_ACTIVE_TRACER: Optional[SpanTracer] = None
+
+
+def start_tracing() -> SpanTracer:
+    """Install a new tracer that all spans report to."""
+    global _ACTIVE_TRACER
+    _ACTIVE_TRACER = SpanTracer()
+    return _ACTIVE_TRACER
+
+
+def is_tracing() -> bool:
+    """Return whether a tracer is installed."""
+    return _ACTIVE_TRACER is not None
+
+
+def stop_tracing() -> None:
+    """Remove the active tracer."""
+    global _ACTIVE_TRACER
+    _ACTIVE_TRACER = None
+
+
+def record(name: str, duration: float) -> None:
+    """Record a duration measured elsewhere, if tracing is active."""
+    tracer = _ACTIVE_TRACER
+    if tracer is not None:
+        tracer.record(name, duration)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as the named phase, if tracing is active."""
+    tracer = _ACTIVE_TRACER
+    if tracer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.record(name, time.perf_counter() - start)
@@ -0,0 +1,177 @@
+"""Incrementally maintained energy rollups for APSystems systems and inverters."""
+
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, ROLLUP_PERIODS
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+ClosedDayCallback = Callable[[date], Awaitable[Dict[str, float]]]
+
+
+def _period_labels(day: date) -> Dict[str, str]:
+    """Return the week, month and year a day belongs to."""
+    iso_year, iso_week, _ = day.isocalendar()
+    return {
+        "week": f"{iso_year}-W{iso_week:02d}",
+        "month": day.strftime("%Y-%m"),
+        "year": day.strftime("%Y"),
+    }
+
+
+def _add_day(totals: Dict[str, Any], day: date, energy: float) -> None:
+    """Add a closed day to the periods it belongs to, starting new periods."""
+    labels = _period_labels(day)
+    for period in ROLLUP_PERIODS:
+        # Labels sort chronologically, so older days never reset a period
+        if labels[period] > totals[period]:
+            totals[period] = labels[period]
+            totals[f"{period}_energy"] = 0.0
+        if labels[period] == totals[period]:
+            totals[f"{period}_energy"] += energy
+
+
+class EnergyRollups:
+    """Week, month and year energy totals kept as running sums.
+
+    For every tracked key (the system and each inverter) only closed days are
+    added to the stored totals, once, when the date rolls over, using the
+    finished day's final value. Each refresh then adds the live value for
+    today, so the cost per refresh does not depend on how long the period is.
+    Days on which Home Assistant never refreshed are backfilled from their
+    final values, and a new key is seeded in the background with the closed
+    days of its current periods before tracking began.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the rollups."""
+        self.hass = hass
+        self.entry = entry
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.rollups")
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._seed_task: Optional[asyncio.Task] = None
+        self._loaded = False
+
+    async def async_update(
+        self,
+        day: date,
+        energy_today: Dict[str, float],
+        async_get_closed_day: ClosedDayCallback,
+    ) -> Dict[str, Dict[str, float]]:
+        """Fold today's live energy per key into the rollups and return them.
+
+        When the stored day has finished, every key is closed with the higher
+        of its last live value and the day's final value, and every day
+        missed since then is added from its final value. Final values are
+        fetched once per day through ``async_get_closed_day``. Keys without a
+        value this refresh keep their previous rollups, and a lower value
+        never replaces a higher one.
+        """
+        if not self._loaded:
+            self._totals = await self._store.async_load() or {}
+            self._loaded = True
+
+        day_label = day.isoformat()
+        stale = [totals["day"] for totals in self._totals.values() if totals["day"] != day_label]
+        if stale:
+            closed: Dict[str, Dict[str, float]] = {}
+            closed_day = min(date.fromisoformat(label) for label in stale)
+            while closed_day < day:
+                closed[closed_day.isoformat()] = await self._async_get_closed(closed_day, async_get_closed_day)
+                closed_day += timedelta(days=1)
+
+            for key, totals in self._totals.items():
+                if totals["day"] == day_label:
+                    continue
+                closed_day = date.fromisoformat(totals["day"])
+                final = closed.get(totals["day"], {}).get(key, 0.0)
+                _add_day(totals, closed_day, max(totals["today"], final))
+                closed_day += timedelta(days=1)
+                while closed_day < day:
+                    _add_day(totals, closed_day, closed[closed_day.isoformat()].get(key, 0.0))
+                    closed_day += timedelta(days=1)
+                _add_day(totals, day, 0.0)
+                totals["day"] = day_label
+                totals["today"] = 0.0
+
+        for key, today in energy_today.items():
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = {"day": day_label, "today": 0.0, "seed_until": day_label}
+                totals.update(_period_labels(day))
+                totals.update({f"{period}_energy": 0.0 for period in ROLLUP_PERIODS})
+            totals["today"] = max(totals["today"], today)
+
+        if self._seed_task is None and any("seed_until" in totals for totals in self._totals.values()):
+            self._seed_task = self.entry.async_create_background_task(
+                self.hass, self._async_seed(async_get_closed_day), f"{DOMAIN} energy rollup seeding"
+            )
+
+        self._store.async_delay_save(lambda: self._totals, SAVE_DELAY)
+        return {
+            key: {
+                period: round(totals[f"{period}_energy"] + totals["today"], 3)
+                for period in ROLLUP_PERIODS
+            }
+            for key, totals in self._totals.items()
+        }
+
+    async def _async_seed(self, async_get_closed_day: ClosedDayCallback) -> None:
+        """Add the closed days of each new key's periods before it was tracked.
+
+        The sums are applied in one step at the end, so an interrupted seeding
+        simply starts over after a restart.
+        """
+        try:
+            pending = {
+                key: date.fromisoformat(totals["seed_until"])
+                for key, totals in self._totals.items()
+                if "seed_until" in totals
+            }
+            seeded: Dict[str, Dict[str, float]] = {key: dict.fromkeys(ROLLUP_PERIODS, 0.0) for key in pending}
+            until_labels = {key: _period_labels(until) for key, until in pending.items()}
+            # The ISO week can start in the previous year
+            closed_day = min(
+                min(date(until.year, 1, 1), until - timedelta(days=until.weekday()))
+                for until in pending.values()
+            )
+            while closed_day < max(pending.values()):
+                closed = await self._async_get_closed(closed_day, async_get_closed_day)
+                labels = _period_labels(closed_day)
+                for key, until in pending.items():
+                    if closed_day >= until:
+                        continue
+                    for period in ROLLUP_PERIODS:
+                        if labels[period] == until_labels[key][period]:
+                            seeded[key][period] += closed.get(key, 0.0)
+                closed_day += timedelta(days=1)
+
+            for key, periods in seeded.items():
+                totals = self._totals[key]
+                for period, energy in periods.items():
+                    if totals[period] == until_labels[key][period]:
+                        totals[f"{period}_energy"] += energy
+                totals.pop("seed_until", None)
+            self._store.async_delay_save(lambda: self._totals, SAVE_DELAY)
+            _LOGGER.info(f"Seeded energy rollups for {len(seeded)} keys")
+        finally:
+            self._seed_task = None
+
+    @staticmethod
+    async def _async_get_closed(day: date, async_get_closed_day: ClosedDayCallback) -> Dict[str, float]:
+        """Return the final values of a finished day, empty when unavailable."""
+        try:
+            return await async_get_closed_day(day)
+        except Exception as err:
+            _LOGGER.warning(f"Failed to get final energy for {day.isoformat()}: {err}")
+            return {}
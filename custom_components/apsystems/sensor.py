@@ -9,10 +9,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SENSOR_TYPES
+from .const import DOMAIN, ROLLUP_PERIODS, SENSOR_TYPES
 from .coordinator import APSystemsDataUpdateCoordinator
+from .entity import APSystemsCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +31,8 @@ async def async_setup_entry(
     entities.append(APSystemsSystemSensor(coordinator, "system_power"))
     entities.append(APSystemsSystemSensor(coordinator, "system_energy_today"))
     entities.append(APSystemsSystemSensor(coordinator, "system_energy_total"))
+    for period in ROLLUP_PERIODS:
+        entities.append(APSystemsSystemSensor(coordinator, f"system_energy_{period}"))
     
     # Inverter-level sensors
     if coordinator.data and "inverters" in coordinator.data:
@@ -40,13 +42,17 @@ async def async_setup_entry(
                 entities.append(APSystemsInverterSensor(coordinator, inverter_id, "inverter_power"))
                 entities.append(APSystemsInverterSensor(coordinator, inverter_id, "inverter_energy_today"))
                 entities.append(APSystemsInverterSensor(coordinator, inverter_id, "inverter_energy_total"))
+                for period in ROLLUP_PERIODS:
+                    entities.append(APSystemsInverterSensor(coordinator, inverter_id, f"inverter_energy_{period}"))
     
     async_add_entities(entities)
 
 
-class APSystemsSystemSensor(CoordinatorEntity, SensorEntity):
+class APSystemsSystemSensor(APSystemsCoordinatorEntity, SensorEntity):
     """Representation of an APSystems system sensor."""
 
+    _span_name = "entity_write.sensor"
+
     def __init__(self, coordinator: APSystemsDataUpdateCoordinator, sensor_type: str) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -91,6 +97,10 @@ class APSystemsSystemSensor(CoordinatorEntity, SensorEntity):
                 # Get total energy
                 energy_value = system_energy.get("energy", 0)
                 return float(energy_value) if energy_value is not None else 0.0
+            elif self._sensor_type.startswith("system_energy_"):
+                # Get week/month/year rollup
+                period = self._sensor_type[len("system_energy_"):]
+                return self.coordinator.data.get("energy_rollups", {}).get("system", {}).get(period)
             
             return None
         except (ValueError, TypeError) as e:
@@ -98,9 +108,11 @@ class APSystemsSystemSensor(CoordinatorEntity, SensorEntity):
             return None
 
 
-class APSystemsInverterSensor(CoordinatorEntity, SensorEntity):
+class APSystemsInverterSensor(APSystemsCoordinatorEntity, SensorEntity):
     """Representation of an APSystems inverter sensor."""
 
+    _span_name = "entity_write.sensor"
+
     def __init__(self, coordinator: APSystemsDataUpdateCoordinator, inverter_id: str, sensor_type: str) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -147,13 +159,16 @@ class APSystemsInverterSensor(CoordinatorEntity, SensorEntity):
                 power_value = inverter_data.get("power", 0)
                 return float(power_value) if power_value is not None else 0.0
             elif self._sensor_type == "inverter_energy_today":
-                # Get today's energy - this would need to be fetched separately
-                # For now, return 0 as we'd need to make additional API calls
-                return 0.0
+                # Get today's energy from the per-ECU batch call
+                return self.coordinator.data.get("inverter_energy_today", {}).get(self._inverter_id)
             elif self._sensor_type == "inverter_energy_total":
                 # Get total energy
                 energy_value = inverter_data.get("energy", 0)
                 return float(energy_value) if energy_value is not None else 0.0
+            elif self._sensor_type.startswith("inverter_energy_"):
+                # Get week/month/year rollup
+                period = self._sensor_type[len("inverter_energy_"):]
+                return self.coordinator.data.get("energy_rollups", {}).get(self._inverter_id, {}).get(period)
             
             return None
         except (ValueError, TypeError) as e:
@@ -0,0 +1,85 @@
+"""Services for the APSystems integration."""
+
+import cProfile
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from . import profiler
+from .const import DOMAIN, SERVICE_PROFILE_REFRESH
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional("system_id"): cv.string,
+        vol.Optional("cycles", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+        vol.Optional("cprofile", default=False): cv.boolean,
+    }
+)
+
+
+def _write_report(path: str, report: Dict[str, Any]) -> None:
+    """Write a profiling report as JSON."""
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the APSystems services."""
+
+    async def async_profile_refresh(call: ServiceCall) -> None:
+        """Run coordinator refresh cycles under the span tracer."""
+        coordinators = [
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if call.data.get("system_id") in (None, coordinator.system_id)
+        ]
+        if not coordinators:
+            raise HomeAssistantError(f"No APSystems system found for {call.data.get('system_id', 'any system')}")
+        if profiler.is_tracing():
+            raise HomeAssistantError("An APSystems refresh profile is already running")
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_path = hass.config.path(f"apsystems_profile_{stamp}")
+        # cProfile only sees the event loop thread; executor threads show up as spans
+        profile = cProfile.Profile() if call.data["cprofile"] else None
+        tracer = profiler.start_tracing()
+        cycles = []
+        try:
+            if profile is not None:
+                profile.enable()
+            for _ in range(call.data["cycles"]):
+                for coordinator in coordinators:
+                    start = time.perf_counter()
+                    await coordinator.async_refresh()
+                    cycles.append({
+                        "system_id": coordinator.system_id,
+                        "duration": round(time.perf_counter() - start, 4),
+                    })
+        finally:
+            if profile is not None:
+                profile.disable()
+            profiler.stop_tracing()
+
+        report = {
+            "started": stamp,
+            "cycles": cycles,
+            "phases": tracer.phases,
+            "executor": coordinators[0].executor.stats,
+        }
+        await hass.async_add_executor_job(_write_report, f"{base_path}.json", report)
+        if profile is not None:
+            await hass.async_add_executor_job(profile.dump_stats, f"{base_path}.prof")
+        _LOGGER.info(f"APSystems refresh profile written to {base_path}.json")
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_REFRESH, async_profile_refresh, schema=PROFILE_REFRESH_SCHEMA
+    )
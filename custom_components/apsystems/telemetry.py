@@ -0,0 +1,179 @@
+"""Columnar decoding of APSystems batch power telemetry."""
+
+import math
+import re
+from array import array
+from typing import Any, Dict, List, Optional
+
+# "uid-channel": [ ... ] arrays in the batch power payload
+_ARRAY_START = re.compile(rb'"([^"\\]+)"\s*:\s*\[')
+_CODE = re.compile(rb'"code"\s*:\s*(-?\d+)')
+_MESSAGE = re.compile(rb'"message"\s*:\s*"([^"\\]*)"')
+_INVERTER_CHANNEL = re.compile(r"^(\w+)-(\d+)$")
+
+
+def _to_float(token: bytes) -> float:
+    """Convert one list element to a float, NaN when missing."""
+    token = token.strip()
+    if not token or token == b"null":
+        return math.nan
+    return float(token)
+
+
+def _to_floats(body: bytes) -> array:
+    """Convert the body of a JSON list of numbers or numeric strings."""
+    tokens = body.replace(b'"', b"").split(b",")
+    try:
+        return array("f", map(float, tokens))
+    except ValueError:
+        # Gaps in the telemetry come through as null or empty strings
+        return array("f", map(_to_float, tokens))
+
+
+def _to_minutes(token: bytes) -> int:
+    """Convert an "HH:mm" or "HH:mm:ss" list element to minutes since midnight."""
+    hours, minutes = token.strip().strip(b'"').split(b":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+class InverterPowerTelemetry:
+    """Power telemetry for every inverter under an ECU, stored column-wise.
+
+    Sample times are kept once in ``times`` as minutes since midnight. Each
+    inverter has a single float32 array holding one row per channel, so a
+    whole-day batch costs a few compact arrays instead of nested lists of
+    strings.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty telemetry."""
+        self.times = array("H")
+        self._power: Dict[str, array] = {}
+        self._channels: Dict[str, List[int]] = {}
+        self._samples: Dict[str, int] = {}
+
+    def add_channel(self, inverter_id: str, channel: int, values: array) -> None:
+        """Append one channel row for an inverter."""
+        samples = self._samples.setdefault(inverter_id, len(values))
+        if len(values) < samples:
+            values.extend([math.nan] * (samples - len(values)))
+        elif len(values) > samples:
+            del values[samples:]
+        self._power.setdefault(inverter_id, array("f")).extend(values)
+        self._channels.setdefault(inverter_id, []).append(channel)
+
+    @property
+    def inverters(self) -> List[str]:
+        """Return the inverter ids present in the payload."""
+        return list(self._power)
+
+    def channels(self, inverter_id: str) -> List[int]:
+        """Return the channel numbers of an inverter, in row order."""
+        return self._channels.get(inverter_id, [])
+
+    def matrix(self, inverter_id: str) -> Optional[memoryview]:
+        """Return a (channels x samples) float32 view of an inverter's power."""
+        power = self._power.get(inverter_id)
+        if power is None:
+            return None
+        shape = [len(self._channels[inverter_id]), self._samples[inverter_id]]
+        return memoryview(power).cast("B").cast("f", shape=shape)
+
+    def channel(self, inverter_id: str, channel: int) -> Optional[memoryview]:
+        """Return a float32 view of one channel's power samples."""
+        channels = self._channels.get(inverter_id, [])
+        if channel not in channels:
+            return None
+        samples = self._samples[inverter_id]
+        start = channels.index(channel) * samples
+        return memoryview(self._power[inverter_id])[start:start + samples]
+
+    def total_power(self, inverter_id: str) -> array:
+        """Return the inverter's power per sample, summed over its channels."""
+        samples = self._samples.get(inverter_id, 0)
+        power = self._power.get(inverter_id, array("f"))
+        total = array("f", bytes(4 * samples))
+        for row in range(0, len(power), samples or 1):
+            for index in range(samples):
+                value = power[row + index]
+                if value == value:
+                    total[index] += value
+        return total
+
+    def last_report(self, inverter_id: str) -> Optional[int]:
+        """Return the time (minutes since midnight) of the last non-zero sample."""
+        samples = min(self._samples.get(inverter_id, 0), len(self.times))
+        power = self._power.get(inverter_id)
+        for index in range(samples - 1, -1, -1):
+            for row in range(0, len(power), self._samples[inverter_id]):
+                if power[row + index] > 0:
+                    return self.times[index]
+        return None
+
+
+class BatchPowerDecoder:
+    """Incrementally decode a batch power payload into columnar telemetry.
+
+    Feed the raw response body in one piece or chunk by chunk as it streams
+    in; only the array currently being parsed is held as bytes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the decoder."""
+        self.telemetry = InverterPowerTelemetry()
+        self._buffer = b""
+        self._code: Optional[int] = None
+        self._message = ""
+
+    def feed(self, chunk: bytes) -> None:
+        """Decode every array that is complete after adding a chunk."""
+        buffer = self._buffer + chunk
+        position = 0
+        while True:
+            match = _ARRAY_START.search(buffer, position)
+            if match is None:
+                break
+            end = buffer.find(b"]", match.end())
+            if end == -1:
+                break
+            self._scan_envelope(buffer[position:match.start()])
+            self._decode_array(match.group(1).decode("utf-8"), buffer[match.end():end])
+            position = end + 1
+        self._buffer = buffer[position:]
+
+    def close(self) -> Dict[str, Any]:
+        """Finish decoding and return the response envelope."""
+        self._scan_envelope(self._buffer)
+        self._buffer = b""
+        if self._code is None:
+            raise ValueError("No response code in batch power payload")
+        if self._code != 0:
+            return {"code": self._code, "data": {}, "message": self._message}
+        return {"code": 0, "data": self.telemetry}
+
+    def _scan_envelope(self, segment: bytes) -> None:
+        """Pick the response code and message out of text between arrays."""
+        if self._code is None and (match := _CODE.search(segment)):
+            self._code = int(match.group(1))
+        if not self._message and (match := _MESSAGE.search(segment)):
+            self._message = match.group(1).decode("utf-8")
+
+    def _decode_array(self, key: str, body: bytes) -> None:
+        """Decode one JSON array into the telemetry columns."""
+        if not body.strip():
+            body = b""
+        if key == "time":
+            tokens = body.split(b",") if body else []
+            self.telemetry.times = array("H", map(_to_minutes, tokens))
+            return
+        if match := _INVERTER_CHANNEL.match(key):
+            self.telemetry.add_channel(
+                match.group(1), int(match.group(2)), _to_floats(body) if body else array("f")
+            )
+
+
+def decode_batch_power(payload: bytes) -> Dict[str, Any]:
+    """Decode a complete batch power payload."""
+    decoder = BatchPowerDecoder()
+    decoder.feed(payload)
+    return decoder.close()
@@ -0,0 +1,223 @@
+"""HTTP transports for the APSystems API client."""
+
+import gzip
+import json
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import IO, Any, Dict, List, Optional
+
+import requests
+
+# Request headers that carry credentials and must never reach a cassette
+SCRUBBED_HEADERS = (
+    "X-CA-AppId",
+    "X-CA-Timestamp",
+    "X-CA-Nonce",
+    "X-CA-Signature-Method",
+    "X-CA-Signature",
+)
+
+REQUEST_TIMEOUT = 30
+
+
+def _open_cassette(path: str, mode: str) -> IO[str]:
+    """Open a cassette file, gzip-compressed when it ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _params_key(params: Optional[Dict[str, Any]]) -> str:
+    """Return a stable key for request parameters."""
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+
+
+class HttpTransport:
+    """Send requests to the APSystems API over the network."""
+
+    def __init__(self) -> None:
+        """Initialize the transport."""
+        self._lock = threading.Lock()
+        self.calls: Counter = Counter()
+        self.elapsed = 0.0
+
+    def _count(self, path: str, elapsed: float) -> None:
+        """Record one call against an API path."""
+        with self._lock:
+            self.calls[path] += 1
+            self.elapsed += elapsed
+
+    def send(self, method: str, base_url: str, path: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None, stream: bool = False) -> requests.Response:
+        """Send a request and return the raw response."""
+        url = f"{base_url}{path}"
+        start = time.monotonic()
+        try:
+            if method.upper() == "GET":
+                return requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT, stream=stream)
+            return requests.request(method, url, headers=headers, json=params, timeout=REQUEST_TIMEOUT, stream=stream)
+        finally:
+            self._count(path, time.monotonic() - start)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return call counts and total time spent in the transport."""
+        with self._lock:
+            return {
+                "calls": sum(self.calls.values()),
+                "calls_by_path": dict(self.calls),
+                "elapsed": round(self.elapsed, 3),
+            }
+
+
+class RecordingTransport(HttpTransport):
+    """Send requests over the network and append them to a cassette file.
+
+    Each interaction is written as one compact JSON line holding the method,
+    path, parameters, response status and body, when it started (seconds
+    since the transport was created) and the time it took. Failed requests
+    are recorded with an error kind instead of a response. Signature headers
+    are dropped before writing.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the transport."""
+        super().__init__()
+        self.path = path
+        self._write_lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def send(self, method: str, base_url: str, path: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None, stream: bool = False) -> requests.Response:
+        """Send a request and record the interaction."""
+        record: Dict[str, Any] = {
+            "method": method.upper(),
+            "path": path,
+            "params": params or {},
+            "headers": {k: v for k, v in headers.items() if k not in SCRUBBED_HEADERS},
+        }
+        start = time.monotonic()
+        record["offset"] = round(start - self._started, 4)
+        try:
+            response = super().send(method, base_url, path, headers, params, stream)
+            body = response.text
+        except requests.exceptions.Timeout:
+            record["error"] = "timeout"
+            raise
+        except requests.exceptions.ConnectionError:
+            record["error"] = "connection"
+            raise
+        except Exception as err:
+            record["error"] = "request"
+            record["message"] = str(err)
+            raise
+        else:
+            record["status"] = response.status_code
+            record["body"] = body
+            return response
+        finally:
+            record["elapsed"] = round(time.monotonic() - start, 4)
+            self._write(record)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append one interaction to the cassette."""
+        line = json.dumps(record, separators=(",", ":"))
+        with self._write_lock, _open_cassette(self.path, "a") as cassette:
+            cassette.write(line + "\n")
+
+
+class ReplayTransport(HttpTransport):
+    """Serve recorded interactions from a cassette file without network access.
+
+    Interactions are matched on method, path and parameters, falling back to
+    the next recording for the same path so a cassette captured on one day
+    can be replayed on another. Each recording is served once, after sleeping
+    its original duration divided by ``speed`` (``0`` disables the delay).
+
+    Replay is driven by the coordinator's refresh schedule, which
+    ``scale_interval`` compresses by the same ``speed``, so a day recorded
+    at 5-minute refreshes plays back in a day divided by ``speed``. With a
+    speed of ``0`` nothing is scheduled and refresh cycles only run on
+    demand, for example through the ``profile_refresh`` service.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        """Initialize the transport and load the cassette."""
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.misses = 0
+        self.recorded_span = 0.0
+        self._started: Optional[float] = None
+        self._recordings: Dict[tuple, List[Dict[str, Any]]] = {}
+        with _open_cassette(path, "r") as cassette:
+            for line in cassette:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self._recordings.setdefault((record["method"], record["path"]), []).append(record)
+                self.recorded_span = max(
+                    self.recorded_span, record.get("offset", 0.0) + record.get("elapsed", 0.0)
+                )
+
+    def scale_interval(self, seconds: float) -> Optional[float]:
+        """Return a refresh interval compressed by ``speed``, None for on-demand only."""
+        if self.speed <= 0:
+            return None
+        return seconds / self.speed
+
+    def _next(self, method: str, path: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Pop the best matching recording, if any is left."""
+        key = _params_key(params)
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            recordings = self._recordings.get((method.upper(), path))
+            if not recordings:
+                self.misses += 1
+                return None
+            for index, record in enumerate(recordings):
+                if _params_key(record["params"]) == key:
+                    return recordings.pop(index)
+            return recordings.pop(0)
+
+    def send(self, method: str, base_url: str, path: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None, stream: bool = False) -> requests.Response:
+        """Return the recorded response for a request."""
+        record = self._next(method, path, params)
+        if record is None:
+            raise requests.exceptions.ConnectionError(f"No recorded interaction for {method} {path}")
+
+        elapsed = record.get("elapsed", 0.0)
+        if self.speed > 0:
+            time.sleep(elapsed / self.speed)
+        self._count(path, elapsed)
+
+        if record.get("error") == "timeout":
+            raise requests.exceptions.Timeout(f"Recorded timeout for {method} {path}")
+        if record.get("error") == "connection":
+            raise requests.exceptions.ConnectionError(f"Recorded connection error for {method} {path}")
+        if record.get("error") or "status" not in record:
+            raise requests.exceptions.RequestException(
+                f"Recorded request error for {method} {path}: {record.get('message', 'no response')}"
+            )
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response._content = record["body"].encode("utf-8")
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json"
+        response.url = f"{base_url}{path}"
+        response.elapsed = timedelta(seconds=elapsed)
+        return response
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return call counts, misses, recordings left and replay duration."""
+        stats = super().stats
+        with self._lock:
+            stats["misses"] = self.misses
+            stats["remaining"] = sum(len(r) for r in self._recordings.values())
+            stats["recorded_span"] = round(self.recorded_span, 3)
+            stats["replay_span"] = round(time.monotonic() - self._started, 3) if self._started else 0.0
+        return stats
@@ -4,21 +4,28 @@ import hashlib
 import hmac
 import time
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import requests
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdfs.pbkdf2 import PBKDF2HMAC
 
+from .profiler import span
+from .telemetry import BatchPowerDecoder
+from .transport import HttpTransport
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class APSystemsAPI:
     """APSystems API client."""
 
-    def __init__(self, app_id: str, app_secret: str):
+    def __init__(self, app_id: str, app_secret: str, transport: Optional[HttpTransport] = None):
         """Initialize the API client."""
         self.app_id = app_id
         self.app_secret = app_secret
         self.base_url = "https://api.apsystemsema.com:9282"
+        self.transport = transport or HttpTransport()
 
     def _generate_signature(self, method: str, path: str) -> Dict[str, str]:
         """Generate the signature for API requests."""
@@ -46,23 +53,32 @@ class APSystemsAPI:
             "X-CA-Signature": signature_b64,
         }
 
-    def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make an authenticated API request."""
-        url = f"{self.base_url}{endpoint}"
-        headers = self._generate_signature(method, endpoint)
+    def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None, decoder: Optional[BatchPowerDecoder] = None, stream: bool = False) -> Dict[str, Any]:
+        """Make an authenticated API request.
+
+        With a decoder the body is decoded by it instead of ``response.json()``,
+        optionally streaming the body in chunks.
+        """
+        with span("sign"):
+            headers = self._generate_signature(method, endpoint)
         headers["Content-Type"] = "application/json"
         
         try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers, params=params, timeout=30)
-            else:
-                response = requests.request(method, url, headers=headers, json=params, timeout=30)
-            
+            with span("network"):
+                response = self.transport.send(method, self.base_url, endpoint, headers, params, stream)
             response.raise_for_status()
             
             # Safely parse JSON response
             try:
-                return response.json()
+                with span("parse"):
+                    if decoder is not None:
+                        if stream:
+                            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                                decoder.feed(chunk)
+                        else:
+                            decoder.feed(response.content)
+                        return decoder.close()
+                    return response.json()
             except ValueError as e:
                 return {"code": 5000, "data": {}, "message": f"Invalid JSON response: {e}"}
             
@@ -147,3 +163,12 @@ class APSystemsAPI:
             "date_range": date,
         }
         return self._make_request("GET", endpoint, params)
+
+    def get_inverter_power_telemetry(self, system_id: str, ecu_id: str, date: str, stream: bool = False) -> Dict[str, Any]:
+        """Get a day of power telemetry for all inverters under an ECU, decoded column-wise."""
+        endpoint = f"/user/api/v2/systems/{system_id}/devices/inverter/batch/energy/{ecu_id}"
+        params = {
+            "energy_level": "power",
+            "date_range": date,
+        }
+        return self._make_request("GET", endpoint, params, decoder=BatchPowerDecoder(), stream=stream)
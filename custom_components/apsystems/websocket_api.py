@@ -0,0 +1,164 @@
+"""Websocket API for bulk APSystems inverter snapshots."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED
+from .coordinator import APSystemsDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Per-inverter columns sent to the frontend, aligned with "uids"
+SNAPSHOT_COLUMNS = ("power", "energy_today", "energy_total")
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the APSystems websocket commands."""
+    websocket_api.async_register_command(hass, ws_snapshot)
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+def _get_coordinator(hass: HomeAssistant, system_id: str) -> Optional[APSystemsDataUpdateCoordinator]:
+    """Return the coordinator for a system id."""
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if coordinator.system_id == system_id:
+            return coordinator
+    return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert an API value to a float, None when missing."""
+    try:
+        return float(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _snapshot(coordinator: APSystemsDataUpdateCoordinator) -> Dict[str, Any]:
+    """Build an array-oriented snapshot of every inverter in the system."""
+    data = coordinator.data or {}
+    inverter_data = data.get("inverter_data", {})
+    energy_today = data.get("inverter_energy_today", {})
+    uids = [inverter.get("uid") for inverter in data.get("inverters", []) if inverter.get("uid")]
+    return {
+        "system_id": coordinator.system_id,
+        "last_update": data.get("last_update"),
+        "uids": uids,
+        "power": [_to_float(inverter_data.get(uid, {}).get("power")) for uid in uids],
+        "energy_today": [_to_float(energy_today.get(uid)) for uid in uids],
+        "energy_total": [_to_float(inverter_data.get(uid, {}).get("energy")) for uid in uids],
+    }
+
+
+def _delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the changed values per column as parallel index/value lists."""
+    changes = {}
+    for column in SNAPSHOT_COLUMNS:
+        index: List[int] = []
+        values: List[Optional[float]] = []
+        for position, (old, new) in enumerate(zip(previous[column], current[column])):
+            if old != new:
+                index.append(position)
+                values.append(new)
+        if index:
+            changes[column] = {"index": index, "value": values}
+    return {"last_update": current["last_update"], "changes": changes}
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "apsystems_api/snapshot",
+        vol.Required("system_id"): str,
+        vol.Optional("include_curve", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_snapshot(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Return the current snapshot of every inverter in a system."""
+    coordinator = _get_coordinator(hass, msg["system_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "System not found")
+        return
+
+    snapshot = _snapshot(coordinator)
+    if msg["include_curve"]:
+        # ECUs sample on their own time grids, so curves are grouped per ECU
+        telemetry = await coordinator.async_get_power_curves()
+        positions = {uid: position for position, uid in enumerate(snapshot["uids"])}
+        curve = {}
+        for ecu_id, ecu_telemetry in telemetry.items():
+            index: List[int] = []
+            power: List[List[float]] = []
+            for uid in ecu_telemetry.inverters:
+                if uid in positions:
+                    index.append(positions[uid])
+                    power.append([round(value, 1) for value in ecu_telemetry.total_power(uid)])
+            curve[ecu_id] = {"times": ecu_telemetry.times.tolist(), "index": index, "power": power}
+        snapshot["curve"] = curve
+
+    connection.send_result(msg["id"], snapshot)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "apsystems_api/subscribe",
+        vol.Required("system_id"): str,
+    }
+)
+@callback
+def ws_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Send a snapshot, then only the values that change after each refresh.
+
+    When the system's config entry is unloaded or reloaded, a final
+    ``{"closed": "unloaded"}`` event ends the subscription so the client can
+    subscribe again.
+    """
+    coordinator = _get_coordinator(hass, msg["system_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "System not found")
+        return
+
+    last = _snapshot(coordinator)
+
+    @callback
+    def _async_forward_update() -> None:
+        """Send the changes since the previous message."""
+        nonlocal last
+        current = _snapshot(coordinator)
+        if current["uids"] != last["uids"]:
+            message = {"snapshot": current}
+        else:
+            message = _delta(last, current)
+            if not message["changes"]:
+                return
+        last = current
+        connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    remove_listener = coordinator.async_add_listener(_async_forward_update)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Stop forwarding updates."""
+        remove_listener()
+        remove_unload_listener()
+
+    @callback
+    def _async_entry_unloaded(entry_id: str) -> None:
+        """End the subscription when its config entry goes away."""
+        if entry_id != coordinator.entry.entry_id:
+            return
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _async_unsubscribe()
+        connection.send_message(websocket_api.event_message(msg["id"], {"closed": "unloaded"}))
+
+    remove_unload_listener = async_dispatcher_connect(hass, SIGNAL_ENTRY_UNLOADED, _async_entry_unloaded)
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"snapshot": last}))
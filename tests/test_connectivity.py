@@ -0,0 +1,57 @@
+"""Tests for the APSystems connectivity tracker."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.apsystems.connectivity import ConnectivityTracker  # noqa: E402
+
+INVERTERS = [{"uid": "801000000001"}]
+INVERTER_ECU = {"801000000001": "216000000001"}
+
+
+def _refresh(tracker: ConnectivityTracker, now: datetime, energy_today: float, lifetime: float) -> dict:
+    """Feed one refresh for a single inverter and return its connectivity."""
+    data = {
+        "inverters": INVERTERS,
+        "inverter_energy_today": {"801000000001": energy_today},
+        "inverter_data": {"801000000001": {"d1": str(energy_today), "t1": str(lifetime)}},
+    }
+    return tracker.async_update(now, data, INVERTER_ECU, {})
+
+
+def test_midnight_reset_is_not_a_report() -> None:
+    """An inverter silent since the evening stays offline across midnight."""
+    hass = MagicMock()
+    tracker = ConnectivityTracker(hass, "system", 1200, 1800)
+
+    now = datetime(2026, 6, 1, 21, 0)
+    _refresh(tracker, now, 5.0, 1000.0)
+    now += timedelta(minutes=5)
+    state = _refresh(tracker, now, 5.5, 1000.5)
+    assert state["inverters"]["801000000001"]["online"] is True
+
+    # Silent from 21:05; the daily totals reset at midnight
+    while now < datetime(2026, 6, 1, 23, 55):
+        now += timedelta(minutes=5)
+        state = _refresh(tracker, now, 5.5, 1000.5)
+    assert state["inverters"]["801000000001"]["online"] is False
+    hass.bus.async_fire.reset_mock()
+
+    for _ in range(6):
+        now += timedelta(minutes=5)
+        state = _refresh(tracker, now, 0.0, 1000.5)
+        assert state["inverters"]["801000000001"] == {
+            "online": False,
+            "last_report": "2026-06-01T21:05:00",
+        }
+        assert state["ecus"]["216000000001"]["online"] is False
+    hass.bus.async_fire.assert_not_called()
+
+    # Production the next morning is a report again
+    now = datetime(2026, 6, 2, 6, 0)
+    _refresh(tracker, now, 0.1, 1000.6)
+    assert hass.bus.async_fire.call_count == 2